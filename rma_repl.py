@@ -68,11 +68,14 @@ class RMLREPL:
             print("❌ Usage: search <value>")
             return
         value = ' '.join(args)
-        results = self.memory.search(value)
-        if results:
-            print(f"🔍 Found {len(results)} result(s):")
-            for path in results:
-                print(f"  → {' -> '.join(path)}")
+        # Stream matches as the generator produces them instead of
+        # materializing the whole result list first
+        count = 0
+        for path in self.memory.isearch(value):
+            print(f"  → {' -> '.join(path)}")
+            count += 1
+        if count:
+            print(f"🔍 Found {count} result(s)")
         else:
             print(f"❌ No results found for: {value}")
 
@@ -82,11 +85,12 @@ class RMLREPL:
             print("❌ Usage: search-key <key>")
             return
         key = args[0]
-        results = self.memory.search_key(key)
-        if results:
-            print(f"🔍 Found {len(results)} path(s) containing '{key}':")
-            for path in results:
-                print(f"  → {' -> '.join(path)}")
+        count = 0
+        for path in self.memory.isearch_key(key):
+            print(f"  → {' -> '.join(path)}")
+            count += 1
+        if count:
+            print(f"🔍 Found {count} path(s) containing '{key}'")
         else:
             print(f"❌ No paths found containing: {key}")
 
@@ -3,24 +3,239 @@ Recursive Memory Architecture (RMA) Simulator
 A pure Python implementation of hierarchical recursive memory structures.
 """
 
+import sys
+import weakref
+from array import array
+from functools import lru_cache
+
+try:
+    # Optional acceleration: JIT the integer-array loops on the compiled
+    # snapshot. The simulator stays pure-Python when these are missing.
+    import numpy as _np
+    from numba import njit as _njit
+except ImportError:
+    _np = None
+    _njit = None
+
+if _njit is not None:
+    @_njit(cache=True)
+    def _depths_from_parents(parent):
+        """Per-node depths from a pre-order parent array (parents precede children)."""
+        n = parent.shape[0]
+        depths = _np.zeros(n, _np.int32)
+        for i in range(1, n):
+            depths[i] = depths[parent[i]] + 1
+        return depths
+else:
+    _depths_from_parents = None
+
+
+def _fmt_value(value):
+    """Render a value the way display() shows it."""
+    return f"'{value}'" if value else "None"
+
+
+@lru_cache(maxsize=4096)
+def _split_path(path):
+    """
+    Split a dotted path string into a tuple of interned segments.
+    Caching means a hot path is split once, and interning lets dict/name
+    comparisons hit CPython's pointer-equality fast path on lookups.
+    """
+    return tuple(sys.intern(part) for part in path.split('.'))
+
+
+class MemorySnapshot:
+    """
+    A frozen, flattened view of a memory tree.
+    Nodes are stored in pre-order as parallel arrays (structure-of-arrays),
+    so read-only traversals run as tight index loops over contiguous data
+    instead of chasing per-node objects around the heap.
+    """
+
+    def __init__(self, root):
+        nodes = []
+        index = {}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            index[id(node)] = len(nodes)
+            nodes.append(node)
+            stack.extend(reversed(node._child_blocks))
+
+        n = len(nodes)
+        self.n = n
+        self.values = [node.value for node in nodes]
+        self.names = [node.name for node in nodes]
+
+        parent = [-1] * n
+        first_child = [-1] * n
+        next_sibling = [-1] * n
+        for i, node in enumerate(nodes):
+            prev = -1
+            for child in node._child_blocks:
+                ci = index[id(child)]
+                parent[ci] = i
+                if prev == -1:
+                    first_child[i] = ci
+                else:
+                    next_sibling[prev] = ci
+                prev = ci
+
+        if _np is not None:
+            self.parent = _np.array(parent, dtype=_np.int32)
+            self.first_child = _np.array(first_child, dtype=_np.int32)
+            self.next_sibling = _np.array(next_sibling, dtype=_np.int32)
+            if _depths_from_parents is not None:
+                self.depth = _depths_from_parents(self.parent)
+            else:
+                self.depth = _np.array(self._fill_depths(parent),
+                                       dtype=_np.int32)
+            self.max_depth = int(self.depth.max()) if n else 0
+        else:
+            depths = self._fill_depths(parent)
+            self.parent = array('i', parent)
+            self.first_child = array('i', first_child)
+            self.next_sibling = array('i', next_sibling)
+            self.depth = array('i', depths)
+            self.max_depth = max(depths) if depths else 0
+
+    @staticmethod
+    def _fill_depths(parent):
+        """One pre-order pass: every parent's depth is set before its children."""
+        depths = [0] * len(parent)
+        for i in range(1, len(parent)):
+            depths[i] = depths[parent[i]] + 1
+        return depths
+
+    def path_of(self, i):
+        """Reconstruct the path from the root to node i via the parent array."""
+        parts = []
+        parent = self.parent
+        names = self.names
+        while i > 0:
+            parts.append(names[i])
+            i = parent[i]
+        parts.reverse()
+        return parts
+
+    def to_dict(self):
+        """Rebuild the nested dict form from the flat arrays."""
+        # Walking the pre-order ids backwards visits children before their
+        # parents, so each node's dict can be assembled in one pass with no
+        # recursion and no call stack to overflow.
+        values = self.values
+        names = self.names
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        built = [None] * self.n
+        for i in range(self.n - 1, -1, -1):
+            result = {"value": values[i]}
+            c = first_child[i]
+            if c != -1:
+                children = {}
+                while c != -1:
+                    children[names[c]] = built[c]
+                    c = next_sibling[c]
+                result["children"] = children
+            built[i] = result
+        return built[0]
+
+
 class MemoryBlock:
     """
     A node in the recursive memory tree.
     Each block can store a value and spawn child blocks dynamically.
+
+    Children live in two parallel lists (names and blocks) rather than a
+    per-node dict: most nodes have only a handful of children, so a linear
+    scan over a small dense list beats paying a ~200-byte hash table per
+    node. Nodes that grow past _MAP_THRESHOLD children get a name->index
+    dict on the side for O(1) lookup.
     """
 
+    __slots__ = ('value', '_child_names', '_child_blocks', '_child_map',
+                 '_parent_ref', 'name', '_cached_path', '_display_value',
+                 '__weakref__')
+
+    _MAP_THRESHOLD = 16
+
     def __init__(self, value=None, parent=None, name=None):
         self.value = value
-        self.children = {}
-        self.parent = parent
+        self._display_value = _fmt_value(value)
+        self._child_names = []
+        self._child_blocks = []
+        self._child_map = None
+        # Weak reference: parents own their children, never the reverse.
+        # Without the cycle a dropped subtree dies by refcount alone
+        # instead of waiting on (and being scanned by) the cyclic GC.
+        self._parent_ref = weakref.ref(parent) if parent is not None else None
         self.name = name
+        self._cached_path = None
+
+    @property
+    def parent(self):
+        """The parent block, or None for the root."""
+        ref = self._parent_ref
+        return ref() if ref is not None else None
+
+    @property
+    def children(self):
+        """Children as a name->block dict (materialized fresh; convenience only)."""
+        return dict(zip(self._child_names, self._child_blocks))
+
+    def child_items(self):
+        """Iterate (name, child) pairs in insertion order."""
+        return zip(self._child_names, self._child_blocks)
+
+    def num_children(self):
+        """Number of direct children."""
+        return len(self._child_names)
+
+    def _find_child(self, name):
+        """Return the child with the given name, or None."""
+        if self._child_map is not None:
+            i = self._child_map.get(name)
+            return self._child_blocks[i] if i is not None else None
+        for i, n in enumerate(self._child_names):
+            if n == name:
+                return self._child_blocks[i]
+        return None
 
     def add_child(self, name, value=None):
         """Add a child memory block."""
+        if self._find_child(name) is not None:
+            # Replace an existing child of the same name, like dict assignment
+            child = MemoryBlock(value=value, parent=self, name=name)
+            idx = self._child_names.index(name)
+            self._child_blocks[idx] = child
+            return child
+        return self._new_child(name, value)
+
+    def _new_child(self, name, value=None):
+        """Append a child known not to exist yet — no existence probe."""
         child = MemoryBlock(value=value, parent=self, name=name)
-        self.children[name] = child
+        self._child_names.append(name)
+        self._child_blocks.append(child)
+        if self._child_map is not None:
+            self._child_map[name] = len(self._child_names) - 1
+        elif len(self._child_names) >= self._MAP_THRESHOLD:
+            self._child_map = {n: i for i, n in enumerate(self._child_names)}
         return child
 
+    def _remove_child(self, name):
+        """Remove a direct child by name. Returns True if it existed."""
+        for i, n in enumerate(self._child_names):
+            if n == name:
+                del self._child_names[i]
+                del self._child_blocks[i]
+                if self._child_map is not None:
+                    self._child_map = {
+                        n: i for i, n in enumerate(self._child_names)
+                    }
+                return True
+        return False
+
     def get_path(self, path):
         """
         Traverse memory via path.
@@ -29,19 +244,21 @@ class MemoryBlock:
         """
         node = self
         for key in path:
-            if key not in node.children:
+            node = node._find_child(key)
+            if node is None:
                 return None
-            node = node.children[key]
         return node
 
     def set_value(self, path, value):
         """Set value at a recursive memory path, creating nodes as needed."""
         node = self
         for key in path:
-            if key not in node.children:
-                node.add_child(key)
-            node = node.children[key]
+            child = node._find_child(key)
+            if child is None:
+                child = node._new_child(key)
+            node = child
         node.value = value
+        node._display_value = _fmt_value(value)
 
     def get_value(self, path):
         """Get value at a path, or None if not found."""
@@ -57,94 +274,130 @@ class MemoryBlock:
         key = path[-1]
 
         parent = self.get_path(parent_path) if parent_path else self
-        if parent and key in parent.children:
-            del parent.children[key]
-            return True
+        if parent is not None:
+            return parent._remove_child(key)
         return False
 
     def search(self, value):
         """Search for all nodes with a given value. Returns list of paths."""
+        # Iterative DFS with an explicit stack: no recursion limit on deep
+        # trees, and path tuples share their prefix instead of copying lists.
         results = []
-        self._search_recursive(value, [], results)
+        stack = [(self, ())]
+        while stack:
+            node, path = stack.pop()
+            if node.value == value:
+                results.append(list(path))
+            for key, child in node.child_items():
+                stack.append((child, path + (key,)))
         return results
 
-    def _search_recursive(self, value, current_path, results):
-        """Helper for recursive search."""
-        if self.value == value:
-            results.append(current_path.copy())
-
-        for key, child in self.children.items():
-            child._search_recursive(value, current_path + [key], results)
-
     def search_key(self, key_name):
         """Find all paths that contain a specific key."""
         results = []
-        self._search_key_recursive(key_name, [], results)
+        stack = [(self, ())]
+        while stack:
+            node, path = stack.pop()
+            for key, child in node.child_items():
+                child_path = path + (key,)
+                if key == key_name:
+                    results.append(list(child_path))
+                stack.append((child, child_path))
         return results
 
-    def _search_key_recursive(self, key_name, current_path, results):
-        """Helper for recursive key search."""
-        for key, child in self.children.items():
-            new_path = current_path + [key]
-            if key == key_name:
-                results.append(new_path)
-            child._search_key_recursive(key_name, new_path, results)
-
     def get_depth(self):
         """Calculate maximum depth of memory tree."""
-        if not self.children:
-            return 0
-        return 1 + max(child.get_depth() for child in self.children.values())
+        max_depth = 0
+        stack = [(self, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth > max_depth:
+                max_depth = depth
+            for child in node._child_blocks:
+                stack.append((child, depth + 1))
+        return max_depth
 
     def count_nodes(self):
         """Count total number of nodes in subtree."""
-        count = 1  # Count self
-        for child in self.children.values():
-            count += child.count_nodes()
+        count = 0
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node._child_blocks)
         return count
 
     def get_full_path(self):
         """Get the full path from root to this node."""
-        path = []
-        node = self
-        while node.parent is not None:
-            if node.name:
-                path.insert(0, node.name)
-            node = node.parent
-        return path
+        # Nodes are never re-parented, so the path is computed once and
+        # cached. Append-then-reverse avoids the O(depth^2) list prepends.
+        if self._cached_path is None:
+            path = []
+            node = self
+            while node.parent is not None:
+                if node.name:
+                    path.append(node.name)
+                node = node.parent
+            path.reverse()
+            self._cached_path = tuple(path)
+        return list(self._cached_path)
+
+    def iter_display_lines(self, level=0, show_paths=False):
+        """Yield the display lines for this subtree, one string per node."""
+        # Each stack entry carries its ready-made indent string, so children
+        # extend the parent's indent instead of recomputing "  " * level.
+        stack = [(self, "  " * level)]
+        while stack:
+            node, indent = stack.pop()
+            display_value = node._display_value
+
+            if show_paths and node.name:
+                path = " -> ".join(node.get_full_path())
+                yield f"{indent}[{node.name}] = {display_value} (path: {path})"
+            elif node.name:
+                yield f"{indent}[{node.name}] = {display_value}"
+            else:
+                yield f"{indent}- {display_value}"
+
+            # Push children in reverse so they pop in insertion order
+            child_indent = indent + "  "
+            for child in reversed(node._child_blocks):
+                stack.append((child, child_indent))
 
     def display(self, level=0, show_paths=False):
         """Display the memory tree structure."""
-        indent = "  " * level
-        display_value = f"'{self.value}'" if self.value else "None"
-
-        if show_paths and self.name:
-            path = " -> ".join(self.get_full_path())
-            print(f"{indent}[{self.name}] = {display_value} (path: {path})")
-        elif self.name:
-            print(f"{indent}[{self.name}] = {display_value}")
-        else:
-            print(f"{indent}- {display_value}")
-
-        for child in self.children.values():
-            child.display(level + 1, show_paths)
+        # One buffered write instead of a print (and flush) per node
+        lines = list(self.iter_display_lines(level, show_paths))
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def to_dict(self):
         """Convert memory structure to nested dictionary."""
-        result = {"value": self.value}
-        if self.children:
-            result["children"] = {
-                key: child.to_dict()
-                for key, child in self.children.items()
-            }
-        return result
+        # Build child dicts before parents by walking pre-order once, then
+        # assembling in reverse — no recursion, works on arbitrarily deep trees.
+        order = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(node._child_blocks)
+
+        built = {}
+        for node in reversed(order):
+            result = {"value": node.value}
+            if node._child_names:
+                result["children"] = {
+                    key: built[id(child)]
+                    for key, child in node.child_items()
+                }
+            built[id(node)] = result
+        return built[id(self)]
 
     def stats(self):
         """Get statistics about the memory structure."""
         return {
             "total_nodes": self.count_nodes(),
             "max_depth": self.get_depth(),
-            "direct_children": len(self.children),
+            "direct_children": self.num_children(),
             "has_value": self.value is not None
         }
 
@@ -155,34 +408,211 @@ class RecursiveMemory:
     Provides high-level operations on the memory tree.
     """
 
-    def __init__(self):
+    __slots__ = ('root', '_snapshot', '_value_index', '_key_index',
+                 '_cache_reads', '_get_cached', '_node_count', '_max_depth')
+
+    def __init__(self, cache_reads=True):
         self.root = MemoryBlock(value="root", name="root")
+        self._snapshot = None
+        # Read cache: path tuple -> value, cleared on any write. Worth it
+        # for read-heavy workloads; pass cache_reads=False to opt out.
+        self._cache_reads = cache_reads
+        if cache_reads:
+            self._get_cached = lru_cache(maxsize=1024)(self._get_uncached)
+        else:
+            self._get_cached = self._get_uncached
+        # Inverted index: value -> insertion-ordered dict of nodes holding it.
+        # Maintained on every write so search() is a single dict lookup.
+        self._value_index = {}
+        self._index_value(self.root)
+        # Same idea for keys: name -> nodes carrying that name, so
+        # search_key() also skips the full-tree DFS. The root is not
+        # indexed; only path segments count as keys.
+        self._key_index = {}
+        # Incrementally maintained stats: node count is always exact;
+        # max depth only grows on writes, so deletes mark it unknown
+        # until the next snapshot recomputes it.
+        self._node_count = 1
+        self._max_depth = 0
+
+    def _index_value(self, node):
+        """Add a node to the value index (unhashable values stay unindexed)."""
+        try:
+            self._value_index.setdefault(node.value, {})[node] = None
+        except TypeError:
+            pass
+
+    def _unindex_value(self, node):
+        """Remove a node from the value index."""
+        try:
+            nodes = self._value_index.get(node.value)
+        except TypeError:
+            return
+        if nodes is not None:
+            nodes.pop(node, None)
+            if not nodes:
+                del self._value_index[node.value]
+
+    def compile(self):
+        """
+        Compile the tree into a flat MemorySnapshot.
+        The snapshot is cached and rebuilt lazily after the next write.
+        """
+        if self._snapshot is None:
+            self._snapshot = MemorySnapshot(self.root)
+        return self._snapshot
 
     def set(self, path, value):
         """Set a value at a path."""
         if isinstance(path, str):
-            path = path.split('.')
-        self.root.set_value(path, value)
+            path = _split_path(path)
+        self._set_tuple(path, value)
+
+    def _set_tuple(self, parts, value):
+        """Write lane for callers that already hold a key tuple — skips the
+        isinstance dispatch and path splitting in set()."""
+        node = self.root
+        depth = 0
+        for key in parts:
+            depth += 1
+            child = node._find_child(key)
+            if child is None:
+                child = node._new_child(key)
+                self._index_value(child)
+                self._key_index.setdefault(key, {})[child] = None
+                self._node_count += 1
+            node = child
+        if self._max_depth is not None and depth > self._max_depth:
+            self._max_depth = depth
+        self._unindex_value(node)
+        node.value = value
+        node._display_value = _fmt_value(value)
+        self._index_value(node)
+        self._invalidate()
+
+    def set_many(self, items):
+        """
+        Bulk-set an iterable of (path, value) pairs.
+        Paths are split once and sorted so writes to sibling paths reuse
+        the shared prefix of the previous descent instead of re-walking
+        from the root every time.
+        """
+        prepared = []
+        for path, value in items:
+            if isinstance(path, str):
+                path = _split_path(path)
+            else:
+                path = tuple(path)
+            prepared.append((path, value))
+        prepared.sort(key=lambda pv: pv[0])
+
+        prev = ()
+        node_stack = [self.root]  # node_stack[i] holds the node at depth i
+        for path, value in prepared:
+            common = 0
+            for a, b in zip(prev, path):
+                if a != b:
+                    break
+                common += 1
+            del node_stack[common + 1:]
+            node = node_stack[-1]
+            for key in path[common:]:
+                child = node._find_child(key)
+                if child is None:
+                    child = node._new_child(key)
+                    self._index_value(child)
+                    self._key_index.setdefault(key, {})[child] = None
+                    self._node_count += 1
+                node = child
+                node_stack.append(node)
+            if self._max_depth is not None and len(path) > self._max_depth:
+                self._max_depth = len(path)
+            self._unindex_value(node)
+            node.value = value
+            node._display_value = _fmt_value(value)
+            self._index_value(node)
+            prev = path
+        self._invalidate()
+
+    def _invalidate(self):
+        """Drop caches that a write makes stale."""
+        self._snapshot = None
+        if self._cache_reads:
+            self._get_cached.cache_clear()
+
+    def _get_uncached(self, path):
+        return self.root.get_value(path)
 
     def get(self, path):
         """Get a value at a path."""
         if isinstance(path, str):
-            path = path.split('.')
-        return self.root.get_value(path)
+            path = _split_path(path)
+        else:
+            path = tuple(path)
+        return self._get_cached(path)
+
+    def _get_tuple(self, parts):
+        """Read lane for callers that already hold a key tuple."""
+        return self._get_cached(parts)
 
     def delete(self, path):
         """Delete a node at a path."""
         if isinstance(path, str):
-            path = path.split('.')
-        return self.root.delete_path(path)
+            path = _split_path(path)
+        if not path:
+            return False
+        node = self.root.get_path(path)
+        if node is None:
+            return False
+        # Purge the whole subtree from the index before unlinking it
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            self._unindex_value(n)
+            named = self._key_index.get(n.name)
+            if named is not None:
+                named.pop(n, None)
+                if not named:
+                    del self._key_index[n.name]
+            self._node_count -= 1
+            stack.extend(n._child_blocks)
+        self._max_depth = None  # unknown until recomputed
+        node.parent._remove_child(path[-1])
+        self._invalidate()
+        return True
+
+    def isearch(self, value):
+        """Yield paths holding a value one at a time."""
+        try:
+            nodes = self._value_index.get(value)
+        except TypeError:
+            # Unhashable query value: stream a full tree scan instead
+            stack = [(self.root, ())]
+            while stack:
+                node, path = stack.pop()
+                if node.value == value:
+                    yield list(path)
+                for key, child in node.child_items():
+                    stack.append((child, path + (key,)))
+            return
+        if nodes:
+            for node in nodes:
+                yield node.get_full_path()
 
     def search(self, value):
         """Search for all occurrences of a value."""
-        return self.root.search(value)
+        return list(self.isearch(value))
+
+    def isearch_key(self, key):
+        """Yield paths whose last key matches, one at a time."""
+        nodes = self._key_index.get(key)
+        if nodes:
+            for node in nodes:
+                yield node.get_full_path()
 
     def search_key(self, key):
         """Search for all paths containing a key."""
-        return self.root.search_key(key)
+        return list(self.isearch_key(key))
 
     def display(self, show_paths=False):
         """Display the entire memory tree."""
@@ -193,11 +623,18 @@ class RecursiveMemory:
 
     def stats(self):
         """Get overall memory statistics."""
-        return self.root.stats()
+        if self._max_depth is None:
+            self._max_depth = self.compile().max_depth
+        return {
+            "total_nodes": self._node_count,
+            "max_depth": self._max_depth,
+            "direct_children": self.root.num_children(),
+            "has_value": self.root.value is not None
+        }
 
     def export(self):
         """Export memory structure as nested dict."""
-        return self.root.to_dict()
+        return self.compile().to_dict()
 
 
 def demo():
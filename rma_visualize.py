@@ -3,26 +3,80 @@ ASCII Visualization for Recursive Memory Architecture
 Creates beautiful tree visualizations without external dependencies.
 """
 
+import sys
+from collections import Counter, defaultdict
+
 from rma_simulator import RecursiveMemory
 
+try:
+    # Optional compiled walker (cythonize -i rma_visualize_cy.pyx); the
+    # pure-Python fallback below is always available
+    from rma_visualize_cy import build_tree_lines as _build_tree_lines
+except ImportError:
+    _build_tree_lines = None
 
-def tree_visualize(memory, max_depth=None, show_values=True):
-    """
-    Create an ASCII tree visualization of the memory structure.
 
-    Args:
-        memory: RecursiveMemory instance
-        max_depth: Maximum depth to display (None for unlimited)
-        show_values: Whether to show node values
+# Branch characters indexed by is_last, hoisted out of the render loop
+_BRANCH = ("├── ", "└── ")
+_CONT = ("│   ", "    ")
+
+# Section rule and histogram bar built once; the bar is sliced per row
+# instead of multiplying a fresh string each time
+_RULE = "=" * 70
+_BAR_CHARS = "█" * 40
+
+
+def _emit(lines):
+    """Write accumulated lines with one buffered stdout write.
+
+    Encoding once and writing bytes skips the text layer's per-write
+    encode. Fall back to the text API when stdout has no buffer, e.g. a
+    StringIO under redirect_stdout.
     """
+    text = "\n".join(lines) + "\n"
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is not None:
+        # Flush the text layer first so prior print() output keeps its order
+        sys.stdout.flush()
+        buffer.write(text.encode("utf-8"))
+    else:
+        sys.stdout.write(text)
+
+
+def _walk(root):
+    """Pre-order DFS shared by the *_from_walk views.
 
-    def _build_tree(node, prefix="", is_last=True, depth=0, path_name="root"):
-        """Recursively build the ASCII tree."""
-        if max_depth and depth >= max_depth:
-            return
+    Returns a list of (node, path, depth) entries, where path is a tuple
+    of key names below the root. Callers that show several views of the
+    same memory can walk once and feed the result to each view instead
+    of re-traversing the tree per view.
+    """
+    entries = []
+    stack = [(root, (), 0)]
+    while stack:
+        node, path, depth = stack.pop()
+        entries.append((node, path, depth))
+        names = node._child_names
+        blocks = node._child_blocks
+        for i in range(len(names) - 1, -1, -1):
+            stack.append((blocks[i], path + (names[i],), depth + 1))
+    return entries
+
+
+def _build_tree_lines_py(root, max_depth, show_values):
+    """Build the ASCII tree lines with an explicit stack (max_depth 0 =
+    unlimited)."""
+    # Children are pushed in reverse so they pop in insertion order,
+    # preserving the DFS order of the old recursive version. The prefix
+    # travels as a tuple of shared segments and is only joined when a
+    # line is emitted, so deep levels don't re-copy the parent prefix.
+    out = []
+    stack = [(root, (), True, 0, "root")]
+    while stack:
+        node, segments, is_last, depth, path_name = stack.pop()
 
         # Determine the branch characters
-        branch = "└── " if is_last else "├── "
+        branch = _BRANCH[is_last]
 
         # Format the node
         value_str = ""
@@ -33,63 +87,103 @@ def tree_visualize(memory, max_depth=None, show_values=True):
                 val = val[:37] + "..."
             value_str = f" = '{val}'"
 
-        # Print the current node
-        print(f"{prefix}{branch}{path_name}{value_str}")
+        # Record the current node; segments is already a tuple, so one
+        # join covers the whole line without f-string formatting
+        out.append("".join(segments + (branch, path_name, value_str)))
 
-        # Prepare prefix for children
-        if is_last:
-            new_prefix = prefix + "    "
-        else:
-            new_prefix = prefix + "│   "
+        # Depth-limit check happens here, before the push, so pruned
+        # subtrees never enter the stack at all
+        if max_depth and depth + 1 >= max_depth:
+            continue
 
-        # Process children
-        children = list(node.children.items())
-        for i, (key, child) in enumerate(children):
-            is_last_child = (i == len(children) - 1)
-            _build_tree(child, new_prefix, is_last_child, depth + 1, key)
+        # Prepare prefix segments for children
+        child_segments = segments + (_CONT[is_last],)
 
-    print("\n" + "="*70)
-    print("🌳 RECURSIVE MEMORY TREE VISUALIZATION")
-    print("="*70 + "\n")
-    _build_tree(memory.root, "", True, 0, "root")
-    print("\n" + "="*70 + "\n")
+        # Process children, indexing the parallel name/block lists
+        # directly rather than materializing a list of pairs
+        names = node._child_names
+        blocks = node._child_blocks
+        n = len(names)
+        for i in range(n - 1, -1, -1):
+            stack.append((blocks[i], child_segments, i == n - 1,
+                          depth + 1, names[i]))
+    return out
 
 
-def horizontal_tree(memory, max_width=80):
-    """
-    Create a horizontal tree layout (left to right).
+if _build_tree_lines is None:
+    _build_tree_lines = _build_tree_lines_py
+
+
+def tree_visualize(memory, max_depth=None, show_values=True):
     """
+    Create an ASCII tree visualization of the memory structure.
 
-    def _get_max_depth(node, depth=0):
-        """Calculate maximum depth."""
-        if not node.children:
-            return depth
-        return max(_get_max_depth(child, depth + 1)
-                   for child in node.children.values())
+    Args:
+        memory: RecursiveMemory instance
+        max_depth: Maximum depth to display (None for unlimited)
+        show_values: Whether to show node values
+    """
+    out = ["\n" + _RULE,
+           "🌳 RECURSIVE MEMORY TREE VISUALIZATION",
+           _RULE + "\n"]
+    out.extend(_build_tree_lines(memory.root, max_depth or 0, show_values))
+    out.append("\n" + _RULE + "\n")
+    _emit(out)
 
-    def _build_layers(node, depth=0, layers=None):
-        """Build layers for horizontal display."""
-        if layers is None:
-            layers = {}
 
-        if depth not in layers:
-            layers[depth] = []
+def horizontal_tree(memory, max_width=80, precomputed_depth=None):
+    """
+    Create a horizontal tree layout (left to right).
+    Pass precomputed_depth (e.g. from memory.stats()) to skip tracking it.
+    """
 
+    def _build_layers(root):
+        """Build layers for horizontal display, tracking max depth as we go."""
+        layers = defaultdict(list)
+        max_depth = 0
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth > max_depth:
+                max_depth = depth
+
+            name = node.name if node.name else "root"
+            value = f"={node.value}" if node.value else ""
+            layers[depth].append(name + value)
+
+            # iterate child blocks only — keys unused; avoids a tuple
+            # allocation per child that pairing with names would cost
+            for child in reversed(node._child_blocks):
+                stack.append((child, depth + 1))
+
+        return layers, max_depth
+
+    layers, max_depth = _build_layers(memory.root)
+    if precomputed_depth is not None:
+        max_depth = precomputed_depth
+    _render_layers(layers, max_depth)
+
+
+def horizontal_tree_from_walk(walk, max_width=80, precomputed_depth=None):
+    """horizontal_tree over a shared _walk() result."""
+    layers = defaultdict(list)
+    max_depth = 0
+    for node, path, depth in walk:
+        if depth > max_depth:
+            max_depth = depth
         name = node.name if node.name else "root"
         value = f"={node.value}" if node.value else ""
-        layers[depth].append(f"{name}{value}")
-
-        for child in node.children.values():
-            _build_layers(child, depth + 1, layers)
-
-        return layers
+        layers[depth].append(name + value)
+    if precomputed_depth is not None:
+        max_depth = precomputed_depth
+    _render_layers(layers, max_depth)
 
-    print("\n" + "="*70)
-    print("🌲 HORIZONTAL MEMORY TREE")
-    print("="*70 + "\n")
 
-    layers = _build_layers(memory.root)
-    max_depth = max(layers.keys())
+def _render_layers(layers, max_depth):
+    """Emit the horizontal layer-by-layer view."""
+    out = ["\n" + _RULE,
+           "🌲 HORIZONTAL MEMORY TREE",
+           _RULE + "\n"]
 
     for depth in range(max_depth + 1):
         indent = "  " * depth
@@ -98,12 +192,14 @@ def horizontal_tree(memory, max_width=80):
 
         # Show up to 5 nodes per layer, then summarize
         if len(nodes) <= 5:
-            print(f"{indent}{arrow}[{', '.join(nodes)}]")
+            out.append("".join((indent, arrow, "[", ", ".join(nodes), "]")))
         else:
-            shown = ', '.join(nodes[:5])
-            print(f"{indent}{arrow}[{shown}, ... +{len(nodes)-5} more]")
+            shown = ", ".join(nodes[:5])
+            out.append("".join((indent, arrow, "[", shown,
+                                f", ... +{len(nodes)-5} more]")))
 
-    print("\n" + "="*70 + "\n")
+    out.append("\n" + _RULE + "\n")
+    _emit(out)
 
 
 def compact_view(memory):
@@ -111,77 +207,114 @@ def compact_view(memory):
     Create a compact path view showing all leaf nodes.
     """
 
-    def _find_leaves(node, current_path=None):
-        """Find all leaf nodes with their paths."""
-        if current_path is None:
-            current_path = []
-
-        leaves = []
-
-        if not node.children:  # Leaf node
-            path_str = ".".join(current_path) if current_path else "root"
-            value = node.value if node.value else "(empty)"
-            leaves.append((path_str, value))
-        else:
-            for key, child in node.children.items():
-                leaves.extend(_find_leaves(child, current_path + [key]))
-
-        return leaves
-
-    print("\n" + "="*70)
-    print("📋 COMPACT VIEW (Leaf Nodes Only)")
-    print("="*70 + "\n")
-
-    leaves = _find_leaves(memory.root)
+    def _find_leaves(root):
+        """Yield (path_str, value) for each leaf node, in tree order."""
+        stack = [(root, ())]
+        while stack:
+            node, path = stack.pop()
+            names = node._child_names
+            if not names:  # Leaf node
+                path_str = ".".join(path) if path else "root"
+                value = node.value if node.value else "(empty)"
+                yield (path_str, value)
+            else:
+                blocks = node._child_blocks
+                for i in range(len(names) - 1, -1, -1):
+                    stack.append((blocks[i], path + (names[i],)))
+
+    _render_compact(_find_leaves(memory.root))
+
+
+def compact_view_from_walk(walk):
+    """compact_view over a shared _walk() result."""
+    leaves = [(".".join(path) if path else "root",
+               node.value if node.value else "(empty)")
+              for node, path, depth in walk if not node._child_names]
+    _render_compact(leaves)
+
+
+def _render_compact(leaves):
+    """Emit the aligned leaf-path listing from any leaf iterable."""
+    out = ["\n" + _RULE,
+           "📋 COMPACT VIEW (Leaf Nodes Only)",
+           _RULE + "\n"]
+
+    # Alignment needs two passes, so drain generators once up front
+    leaves = list(leaves)
 
     if not leaves:
-        print("  (empty memory)")
+        out.append("  (empty memory)")
     else:
         # Find max path length for alignment
         max_path_len = max(len(path) for path, _ in leaves)
 
-        for path, value in sorted(leaves):
+        # Leaves come straight out of the DFS, so they already appear in
+        # tree order; sorting them again would cost O(n log n) for no gain
+        for path, value in leaves:
             # Truncate long values
             val_str = str(value)
             if len(val_str) > 50:
                 val_str = val_str[:47] + "..."
 
-            print(f"  {path:<{max_path_len}} → {val_str}")
+            # ljust skips re-parsing the dynamic width spec on every line
+            out.append("".join(("  ", path.ljust(max_path_len), " → ",
+                                val_str)))
 
-    print("\n" + "="*70 + "\n")
+    out.append("\n" + _RULE + "\n")
+    _emit(out)
 
 
-def depth_histogram(memory):
+def depth_histogram(memory, precomputed_counts=None):
     """
     Show a histogram of nodes by depth.
+    Pass precomputed_counts (a depth -> count mapping) to skip the walk.
     """
 
-    def _count_by_depth(node, depth=0, counts=None):
+    def _count_by_depth(root):
         """Count nodes at each depth."""
-        if counts is None:
-            counts = {}
+        counts = Counter()
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            counts[depth] += 1
+            # iterate child blocks only — keys unused in a count walk
+            for child in node._child_blocks:
+                stack.append((child, depth + 1))
 
-        counts[depth] = counts.get(depth, 0) + 1
+        return counts
 
-        for child in node.children.values():
-            _count_by_depth(child, depth + 1, counts)
+    if precomputed_counts is not None:
+        counts = precomputed_counts
+    else:
+        counts = _count_by_depth(memory.root)
+    _render_histogram(counts)
 
-        return counts
 
-    print("\n" + "="*70)
-    print("📊 DEPTH HISTOGRAM")
-    print("="*70 + "\n")
+def depth_histogram_from_walk(walk, precomputed_counts=None):
+    """depth_histogram over a shared _walk() result."""
+    if precomputed_counts is not None:
+        counts = precomputed_counts
+    else:
+        counts = Counter(depth for _, _, depth in walk)
+    _render_histogram(counts)
+
+
+def _render_histogram(counts):
+    """Emit the per-depth bar chart."""
+    out = ["\n" + _RULE,
+           "📊 DEPTH HISTOGRAM",
+           _RULE + "\n"]
 
-    counts = _count_by_depth(memory.root)
     max_count = max(counts.values())
 
     for depth in sorted(counts.keys()):
         count = counts[depth]
         bar_length = int((count / max_count) * 40)
-        bar = "█" * bar_length
-        print(f"  Depth {depth}: {bar} ({count} nodes)")
+        bar = _BAR_CHARS[:bar_length]
+        out.append(f"  Depth {depth}: {bar} ({count} nodes)")
 
-    print("\n" + "="*70 + "\n")
+    out.append("\n" + _RULE + "\n")
+    _emit(out)
 
 
 def demo():
@@ -212,28 +345,33 @@ def demo():
 
     # Show different visualizations
     print("\n🎨 RECURSIVE MEMORY ARCHITECTURE VISUALIZATIONS")
-    print("="*70)
+    print(_RULE)
+
+    # Stats are O(1) now that the memory maintains them incrementally;
+    # grab them once and let the views reuse what they can. The layer,
+    # leaf and histogram views also share a single tree walk.
+    stats = memory.stats()
+    walk = _walk(memory.root)
 
     # 1. Traditional tree
     tree_visualize(memory, show_values=True)
 
     # 2. Horizontal layout
-    horizontal_tree(memory)
+    horizontal_tree_from_walk(walk, precomputed_depth=stats['max_depth'])
 
     # 3. Compact leaf view
-    compact_view(memory)
+    compact_view_from_walk(walk)
 
     # 4. Depth histogram
-    depth_histogram(memory)
+    depth_histogram_from_walk(walk)
 
     # Show stats
-    stats = memory.stats()
     print("📈 OVERALL STATISTICS")
-    print("="*70)
+    print(_RULE)
     print(f"  Total nodes:     {stats['total_nodes']}")
     print(f"  Maximum depth:   {stats['max_depth']}")
     print(f"  Direct children: {stats['direct_children']}")
-    print("="*70 + "\n")
+    print(_RULE + "\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,52 @@
+# cython: language_level=3
+"""
+Cython port of the hot tree-emit walk from rma_visualize.
+
+Optional: build in place with `cythonize -i rma_visualize_cy.pyx`.
+rma_visualize falls back to its pure-Python walker when this module is
+not built, so nothing in the repo requires Cython.
+"""
+
+_BRANCH = ("├── ", "└── ")
+_CONT = ("│   ", "    ")
+
+
+cpdef list build_tree_lines(object root, int max_depth, bint show_values):
+    """Return formatted tree lines for root's subtree (max_depth 0 = unlimited).
+
+    Same algorithm as the pure-Python walker; the win is moving the
+    branchy per-node loop and string work off interpreter dispatch.
+    """
+    cdef list out = []
+    cdef list stack = [(root, "", True, 0, "root")]
+    cdef str prefix, path_name, value_str, val, child_prefix
+    cdef object node, names, blocks
+    cdef Py_ssize_t i, n
+    cdef int depth
+    cdef bint is_last
+
+    while stack:
+        node, prefix, is_last, depth, path_name = stack.pop()
+
+        value_str = ""
+        if show_values and node.value is not None:
+            val = str(node.value)
+            if len(val) > 40:
+                val = val[:37] + "..."
+            value_str = f" = '{val}'"
+
+        out.append(f"{prefix}{_BRANCH[is_last]}{path_name}{value_str}")
+
+        # Prune before pushing so skipped subtrees never enter the stack
+        if max_depth and depth + 1 >= max_depth:
+            continue
+
+        child_prefix = prefix + _CONT[is_last]
+        names = node._child_names
+        blocks = node._child_blocks
+        n = len(names)
+        for i in range(n - 1, -1, -1):
+            stack.append((blocks[i], child_prefix, i == n - 1, depth + 1,
+                          names[i]))
+
+    return out
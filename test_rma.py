@@ -3,9 +3,36 @@ Test suite for Recursive Memory Architecture
 Run with: python test_rma.py
 """
 
+import io
+import sys
+from contextlib import redirect_stdout
+
 from rma_simulator import RecursiveMemory, MemoryBlock
 
 
+# Shared read-only memory, built once and reused by the tests that only
+# query it (the runner has no fixtures, so this is the manual equivalent
+# of a module-scoped one). Tests that mutate state build their own
+# instance.
+_SHARED = None
+
+# Built once at import instead of per run inside test_deep_nesting
+_DEEP_PATH = tuple(f"level_{i}" for i in range(20))
+
+
+def _shared_memory():
+    global _SHARED
+    if _SHARED is None:
+        _SHARED = RecursiveMemory()
+        _SHARED.set("path1.a", "target")
+        _SHARED.set("path2.b", "target")
+        _SHARED.set("path3.c", "other")
+        _SHARED.set("a.target.x", "val1")
+        _SHARED.set("b.target.y", "val2")
+        _SHARED.set("c.other.z", "val3")
+    return _SHARED
+
+
 def test_basic_set_get():
     """Test basic set and get operations."""
     print("Testing basic set/get... ", end="")
@@ -62,11 +89,7 @@ def test_delete():
 def test_search_value():
     """Test search by value."""
     print("Testing search by value... ", end="")
-    memory = RecursiveMemory()
-
-    memory.set("path1.a", "target")
-    memory.set("path2.b", "target")
-    memory.set("path3.c", "other")
+    memory = _shared_memory()
 
     results = memory.search("target")
 
@@ -77,11 +100,7 @@ def test_search_value():
 def test_search_key():
     """Test search by key."""
     print("Testing search by key... ", end="")
-    memory = RecursiveMemory()
-
-    memory.set("a.target.x", "val1")
-    memory.set("b.target.y", "val2")
-    memory.set("c.other.z", "val3")
+    memory = _shared_memory()
 
     results = memory.search_key("target")
 
@@ -146,9 +165,8 @@ def test_full_path():
 def test_export():
     """Test export to dict."""
     print("Testing export... ", end="")
-    memory = RecursiveMemory()
+    memory = _shared_memory()
 
-    memory.set("a.b", "value")
     exported = memory.export()
 
     assert "children" in exported, "Export should have children"
@@ -159,7 +177,7 @@ def test_export():
 def test_empty_get():
     """Test getting non-existent paths."""
     print("Testing non-existent path... ", end="")
-    memory = RecursiveMemory()
+    memory = _shared_memory()
 
     result = memory.get("does.not.exist")
     assert result is None, f"Expected None, got {result}"
@@ -205,11 +223,10 @@ def test_deep_nesting():
     print("Testing deep nesting... ", end="")
     memory = RecursiveMemory()
 
-    # Create a 20-level deep path
-    path = [f"level_{i}" for i in range(20)]
-    memory.set(path, "deep_value")
+    # Use the precomputed 20-level deep path
+    memory.set(_DEEP_PATH, "deep_value")
 
-    result = memory.get(path)
+    result = memory.get(_DEEP_PATH)
     assert result == "deep_value", f"Expected 'deep_value', got {result}"
     assert memory.root.get_depth() == 20
     print("✓")
@@ -239,6 +256,24 @@ def test_delete_nonexistent():
     print("✓")
 
 
+def test_set_many():
+    """Test bulk set of multiple paths."""
+    print("Testing set_many... ", end="")
+    memory = RecursiveMemory()
+
+    memory.set_many([
+        ("a.b.c", 1),
+        ("a.b.d", 2),
+        ("x.y", 3),
+    ])
+
+    assert memory.get("a.b.c") == 1
+    assert memory.get("a.b.d") == 2
+    assert memory.get("x.y") == 3
+    assert len(memory.search(2)) == 1
+    print("✓")
+
+
 def test_search_empty():
     """Test search on empty memory."""
     print("Testing search on empty memory... ", end="")
@@ -250,7 +285,17 @@ def test_search_empty():
 
 
 def run_all_tests():
-    """Run all test functions."""
+    """Run all test functions, buffering output into a single write."""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        ok = _run_tests()
+    sys.stdout.write(buffer.getvalue())
+    sys.stdout.flush()
+    return ok
+
+
+def _run_tests():
+    """Run the test functions against the current stdout."""
     print("\n" + "="*60)
     print("🧪 RECURSIVE MEMORY ARCHITECTURE TEST SUITE")
     print("="*60 + "\n")
@@ -273,6 +318,7 @@ def run_all_tests():
         test_deep_nesting,
         test_intermediate_nodes,
         test_delete_nonexistent,
+        test_set_many,
         test_search_empty,
     ]
 